@@ -11,13 +11,13 @@ Usage:
 
 import argparse
 import json
+import math
 import os
 import struct
 import sys
 import tempfile
 
 import numpy as np
-from scipy.ndimage import zoom
 
 
 # Scale presets: name -> (radius_km, grid_size, default_vert_exag)
@@ -31,13 +31,37 @@ SCALE_PRESETS = {
 
 
 def geocode_place(place_name):
-    """Geocode a place name to (lat, lon) using geopy."""
+    """Geocode a place name to (lat, lon) using geopy.
+
+    Results are cached in ~/.cache/flood-sim/geocode.json so repeat runs
+    with the same --place skip the Nominatim round trip (and its rate
+    limits)."""
+    cache_path = os.path.join(os.path.expanduser('~'), '.cache', 'flood-sim', 'geocode.json')
+    cache = {}
+    if os.path.exists(cache_path):
+        try:
+            with open(cache_path) as f:
+                cache = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            cache = {}
+
+    if place_name in cache:
+        lat, lon = cache[place_name]
+        print(f"  Geocoded '{place_name}' -> ({lat:.4f}, {lon:.4f}) [cached]")
+        return lat, lon
+
     from geopy.geocoders import Nominatim
     geolocator = Nominatim(user_agent="flood-sim-pipeline")
     location = geolocator.geocode(place_name)
     if location is None:
         raise ValueError(f"Could not geocode: {place_name}")
     print(f"  Geocoded '{place_name}' -> ({location.latitude:.4f}, {location.longitude:.4f})")
+
+    cache[place_name] = [location.latitude, location.longitude]
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    with open(cache_path, 'w') as f:
+        json.dump(cache, f, indent=2)
+
     return location.latitude, location.longitude
 
 
@@ -45,7 +69,7 @@ def compute_bounds(lat, lon, radius_km):
     """Compute bounding box from center + radius in km."""
     # Approximate degrees per km
     lat_deg_per_km = 1.0 / 111.0
-    lon_deg_per_km = 1.0 / (111.0 * np.cos(np.radians(lat)))
+    lon_deg_per_km = 1.0 / (111.0 * math.cos(math.radians(lat)))
 
     dlat = radius_km * lat_deg_per_km
     dlon = radius_km * lon_deg_per_km
@@ -56,7 +80,6 @@ def compute_bounds(lat, lon, radius_km):
 def get_srtm_tile_names(bounds):
     """Get list of SRTM tile names needed to cover bounds."""
     south, west, north, east = bounds
-    import math
     tiles = []
     for lat in range(math.floor(south), math.floor(north) + 1):
         for lon in range(math.floor(west), math.floor(east) + 1):
@@ -75,8 +98,11 @@ def fetch_srtm_tiles(bounds, cache_dir=None):
     2. Our own cache dir
     3. Downloads from AWS S3 elevation-tiles-prod
     """
+    import concurrent.futures
     import gzip
-    import urllib.request
+    import shutil
+
+    import urllib3
 
     if cache_dir is None:
         cache_dir = os.path.join(os.path.expanduser('~'), '.cache', 'flood-sim', 'srtm')
@@ -87,6 +113,7 @@ def fetch_srtm_tiles(bounds, cache_dir=None):
 
     tiles = get_srtm_tile_names(bounds)
     paths = []
+    missing = []
 
     for tile_name, lat, lon in tiles:
         lat_dir = f"{'N' if lat >= 0 else 'S'}{abs(lat):02d}"
@@ -105,66 +132,159 @@ def fetch_srtm_tiles(bounds, cache_dir=None):
             paths.append(our_cached)
             continue
 
-        # Download from AWS
+        missing.append((tile_name, lat_dir))
+
+    if not missing:
+        return paths
+
+    # Download missing tiles concurrently over a shared connection pool
+    # (all tiles come from the same S3 host, so sockets get reused)
+    http = urllib3.PoolManager(maxsize=8)
+
+    def fetch_one(job):
+        tile_name, lat_dir = job
         url = f"https://s3.amazonaws.com/elevation-tiles-prod/skadi/{lat_dir}/{tile_name}.hgt.gz"
-        gz_path = os.path.join(cache_dir, f"{tile_name}.hgt.gz")
         hgt_path = os.path.join(cache_dir, f"{tile_name}.hgt")
 
         print(f"  Downloading {tile_name} from {url}...")
+        part_path = hgt_path + '.part'
         try:
-            urllib.request.urlretrieve(url, gz_path)
-            # Decompress
-            with gzip.open(gz_path, 'rb') as f_in:
-                with open(hgt_path, 'wb') as f_out:
-                    f_out.write(f_in.read())
-            os.remove(gz_path)
+            resp = http.request('GET', url, preload_content=False)
+            try:
+                if resp.status != 200:
+                    raise RuntimeError(f"HTTP {resp.status}")
+                # Decompress straight from the response stream in chunks —
+                # no intermediate .gz on disk, no full tile in memory.
+                # Write to a .part file first so an interrupted transfer
+                # never leaves a truncated .hgt for the cache check to find
+                with gzip.GzipFile(fileobj=resp) as gz:
+                    with open(part_path, 'wb') as f_out:
+                        shutil.copyfileobj(gz, f_out, length=1 << 20)
+            finally:
+                # Discard any unread body (non-200, mid-stream failure)
+                # so the shared pool never gets a dirty socket back
+                resp.drain_conn()
+                resp.release_conn()
+            os.replace(part_path, hgt_path)
             print(f"  Saved: {hgt_path}")
-            paths.append(hgt_path)
+            return hgt_path
         except Exception as e:
             print(f"  WARNING: Failed to download {tile_name}: {e}")
+            if os.path.exists(part_path):
+                os.remove(part_path)
+            return None
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as ex:
+        for result in ex.map(fetch_one, missing):
+            if result is not None:
+                paths.append(result)
 
     return paths
 
 
+def fill_nodata(data, nodata=None):
+    """Replace nodata cells (dataset sentinel and SRTM voids <= -1000)
+    with the minimum valid elevation, in place, in a single pass."""
+    bad = data <= -1000
+    if nodata is not None:
+        bad |= data == nodata
+    if bad.any():
+        good = ~bad
+        np.copyto(data, data[good].min() if good.any() else 0, where=bad)
+    return data
+
+
+def resample_grid(data, grid_size):
+    """Resample a 2D DEM array to grid_size x grid_size.
+
+    Prefers cv2.resize (SIMD separable filters, INTER_AREA when
+    downscaling avoids aliasing), then PIL's bicubic (also separable),
+    and only then scipy's non-separable cubic zoom."""
+    if data.shape == (grid_size, grid_size):
+        return data
+    try:
+        import cv2
+        downscaling = data.shape[0] > grid_size and data.shape[1] > grid_size
+        interp = cv2.INTER_AREA if downscaling else cv2.INTER_CUBIC
+        return cv2.resize(np.ascontiguousarray(data, dtype=np.float32),
+                          (grid_size, grid_size), interpolation=interp)
+    except ImportError:
+        pass
+    try:
+        from PIL import Image
+        img = Image.fromarray(np.ascontiguousarray(data, dtype=np.float32), mode='F')
+        return np.asarray(img.resize((grid_size, grid_size), Image.BICUBIC))
+    except ImportError:
+        from scipy.ndimage import zoom
+        zoom_y = grid_size / data.shape[0]
+        zoom_x = grid_size / data.shape[1]
+        return zoom(data, (zoom_y, zoom_x), order=3)
+
+
+def load_hgt(hgt_path, bounds, grid_size):
+    """Load a single SRTM .hgt tile via memmap, clip to bounds, resample.
+
+    .hgt is a headerless big-endian int16 square raster (1201^2 or
+    3601^2) covering one degree; the filename encodes the SW corner
+    (e.g. S40E176). Memory-mapping lets the kernel page in only the rows
+    inside the bounds window — no rasterio/GDAL setup, no full read."""
+    import re
+
+    m = re.match(r'([NS])(\d{2})([EW])(\d{3})', os.path.basename(hgt_path))
+    if m is None:
+        raise ValueError(f"Cannot parse tile origin from {hgt_path}")
+    tile_south = int(m.group(2)) * (1 if m.group(1) == 'N' else -1)
+    tile_west = int(m.group(4)) * (1 if m.group(3) == 'E' else -1)
+    tile_north = tile_south + 1
+
+    n = int(round(math.sqrt(os.path.getsize(hgt_path) / 2)))
+    arr = np.memmap(hgt_path, dtype='>i2', mode='r', shape=(n, n))
+
+    # Row 0 is the tile's north edge; pixels are 1/(n-1) degrees apart
+    south, west, north, east = bounds
+    row_min = max(0, int((tile_north - north) * (n - 1)))
+    row_max = min(n, int(math.ceil((tile_north - south) * (n - 1))) + 1)
+    col_min = max(0, int((west - tile_west) * (n - 1)))
+    col_max = min(n, int(math.ceil((east - tile_west) * (n - 1))) + 1)
+
+    data = arr[row_min:row_max, col_min:col_max].astype(np.float32)
+    del arr
+
+    fill_nodata(data)
+    data = resample_grid(data, grid_size)
+
+    return data.astype(np.float32), bounds
+
+
 def load_srtm_tiles(tile_paths, bounds, grid_size):
     """Load and merge SRTM tiles, clip to bounds, resample to grid_size."""
     import rasterio
     from rasterio.windows import from_bounds
 
     if len(tile_paths) == 1:
-        # Single tile - simple path
+        # Single tile - simple path; raw .hgt skips rasterio entirely
+        if tile_paths[0].endswith('.hgt'):
+            return load_hgt(tile_paths[0], bounds, grid_size)
         return load_and_resample(tile_paths[0], bounds, grid_size)
 
-    # Multiple tiles - merge them
+    # Multiple tiles - merge, clipped to bounds at roughly the target
+    # resolution, so we never materialize the full mosaic
     from rasterio.merge import merge
+    south, west, north, east = bounds
+    target_res = max(north - south, east - west) / grid_size
     datasets = [rasterio.open(p) for p in tile_paths]
-    merged, merged_transform = merge(datasets)
+    merged, merged_transform = merge(
+        datasets, bounds=(west, south, east, north), res=target_res)
     for ds in datasets:
         ds.close()
 
     data = merged[0]  # first band
 
-    # Clip to bounds
-    south, west, north, east = bounds
-    # Convert bounds to pixel coordinates using the merged transform
-    inv_transform = ~merged_transform
-    col_min, row_min = inv_transform * (west, north)
-    col_max, row_max = inv_transform * (east, south)
-    col_min, col_max = int(max(0, col_min)), int(min(data.shape[1], col_max))
-    row_min, row_max = int(max(0, row_min)), int(min(data.shape[0], row_max))
-    data = data[row_min:row_max, col_min:col_max]
-
     # Handle nodata
-    mask_bad = data <= -1000
-    if mask_bad.any():
-        valid = data[~mask_bad]
-        data[mask_bad] = valid.min() if len(valid) > 0 else 0
+    fill_nodata(data)
 
     # Resample
-    if data.shape[0] != grid_size or data.shape[1] != grid_size:
-        zoom_y = grid_size / data.shape[0]
-        zoom_x = grid_size / data.shape[1]
-        data = zoom(data, (zoom_y, zoom_x), order=3)
+    data = resample_grid(data, grid_size)
 
     return data.astype(np.float32), bounds
 
@@ -172,41 +292,33 @@ def load_srtm_tiles(tile_paths, bounds, grid_size):
 def load_and_resample(tif_path, bounds, grid_size):
     """Load GeoTIFF, clip to bounds, resample to grid_size x grid_size."""
     import rasterio
+    from rasterio.enums import Resampling
     from rasterio.windows import from_bounds
 
     with rasterio.open(tif_path) as src:
+        window = None
         if bounds is not None:
             south, west, north, east = bounds
             window = from_bounds(west, south, east, north, src.transform)
+
+        data = None
+        if src.nodata is None:
+            # Resample at read time: GDAL streams the decimated window,
+            # so only grid_size^2 pixels ever reach Python
+            data = src.read(1, window=window, out_shape=(grid_size, grid_size),
+                            resampling=Resampling.cubic)
+            if (data <= -1000).any():
+                # Undeclared SRTM sentinel survived the decimation, so
+                # blended void values may lurk above -1000 too — redo
+                # this read through the safe fill-then-resample path
+                data = None
+        if data is None:
+            # GDAL's read-time decimation is not nodata-aware — the
+            # sentinel would bleed into valid pixels. Fill voids at
+            # native resolution first, then resample
             data = src.read(1, window=window)
-        else:
-            data = src.read(1)
-
-        # Handle nodata
-        nodata = src.nodata
-        if nodata is not None:
-            mask = data == nodata
-            if mask.any():
-                valid = data[~mask]
-                if len(valid) > 0:
-                    data[mask] = valid.min()
-                else:
-                    data[mask] = 0
-
-        # Also handle SRTM typical nodata of -32768
-        mask_srtm = data <= -1000
-        if mask_srtm.any():
-            valid = data[~mask_srtm]
-            if len(valid) > 0:
-                data[mask_srtm] = valid.min()
-            else:
-                data[mask_srtm] = 0
-
-        # Resample to target grid size
-        if data.shape[0] != grid_size or data.shape[1] != grid_size:
-            zoom_y = grid_size / data.shape[0]
-            zoom_x = grid_size / data.shape[1]
-            data = zoom(data, (zoom_y, zoom_x), order=3)
+            fill_nodata(data, src.nodata)
+            data = resample_grid(data, grid_size)
 
         # Get transform info for cell size calculation
         if bounds is not None:
@@ -235,8 +347,10 @@ def compute_vertical_exaggeration(elev_data):
 
 def fetch_osm_overlay(bounds, output_path, tile_size=256):
     """Download OpenStreetMap tiles for the bounding box and composite into a single image."""
-    import math
-    import urllib.request
+    import concurrent.futures
+    import io
+
+    import urllib3
     from PIL import Image
 
     south, west, north, east = bounds
@@ -276,21 +390,58 @@ def fetch_osm_overlay(bounds, output_path, tile_size=256):
     # Download and composite
     composite = Image.new('RGB', (cols * tile_size, rows * tile_size))
 
-    headers = {'User-Agent': 'flood-sim-pipeline/1.0 (educational project)'}
+    # Modest worker count + pooled connections, per OSM tile usage policy
+    http = urllib3.PoolManager(
+        maxsize=4,
+        headers={'User-Agent': 'flood-sim-pipeline/1.0 (educational project)'},
+    )
+
+    # Tiles are immutable enough for our purposes — cache them like SRTM
+    osm_cache = os.path.join(os.path.expanduser('~'), '.cache', 'flood-sim', 'osm')
+
+    jobs = [
+        (tx, ty, (tx - x_min) * tile_size, (ty - y_min) * tile_size)
+        for ty in range(y_min, y_max + 1)
+        for tx in range(x_min, x_max + 1)
+    ]
+
+    def fetch_tile(job):
+        tx, ty, px, py = job
+        cache_path = os.path.join(osm_cache, str(z), str(tx), f"{ty}.png")
+        try:
+            if os.path.exists(cache_path) and os.path.getsize(cache_path) > 0:
+                try:
+                    img = Image.open(cache_path)
+                    img.load()  # decode now — Image.open is lazy and a bad
+                    return px, py, img  # tile must fail here, not at paste
+                except Exception:
+                    os.remove(cache_path)  # purge the corrupt entry
+                    raise
 
-    for ty in range(y_min, y_max + 1):
-        for tx in range(x_min, x_max + 1):
             url = f"https://tile.openstreetmap.org/{z}/{tx}/{ty}.png"
-            try:
-                req = urllib.request.Request(url, headers=headers)
-                with urllib.request.urlopen(req) as resp:
-                    tile_data = resp.read()
-                tile_img = Image.open(__import__('io').BytesIO(tile_data))
-                px = (tx - x_min) * tile_size
-                py = (ty - y_min) * tile_size
+            resp = http.request('GET', url)
+            if resp.status != 200:
+                raise RuntimeError(f"HTTP {resp.status}")
+            img = Image.open(io.BytesIO(resp.data))
+            img.load()
+            # Write via .part + rename (as for SRTM tiles) so an
+            # interrupted run never leaves a truncated cache entry
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            part_path = cache_path + '.part'
+            with open(part_path, 'wb') as f:
+                f.write(resp.data)
+            os.replace(part_path, cache_path)
+            return px, py, img
+        except Exception as e:
+            print(f"  WARNING: Failed to fetch tile {z}/{tx}/{ty}: {e}")
+            return None
+
+    # PIL paste isn't thread-safe, so composite on the main thread
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as ex:
+        for result in ex.map(fetch_tile, jobs):
+            if result is not None:
+                px, py, tile_img = result
                 composite.paste(tile_img, (px, py))
-            except Exception as e:
-                print(f"  WARNING: Failed to fetch tile {z}/{tx}/{ty}: {e}")
 
     # Crop to exact bounds
     nw_lat, nw_lon = tile_to_lat_lon(x_min, y_min, z)
@@ -378,10 +529,61 @@ def elevation_to_color(elev):
         )
 
 
-def build_mesh(elev_data, grid_size, cell_size_m, vert_exag):
-    """Build a trimesh mesh with elevation-based vertex colors."""
-    import trimesh
-
+def elevation_to_colors(elev):
+    """Vectorized form of elevation_to_color for a whole elevation array.
+    Returns an (H, W, 3) float32 array in 0-1 range."""
+    elev = np.asarray(elev)
+
+    conds = [
+        elev < 0,
+        elev < 5,
+        elev < 30,
+        elev < 80,
+        elev < 200,
+        elev < 500,
+    ]
+
+    # Per-band interpolation parameters, matching elevation_to_color:
+    # (lo, hi, base_rgb, delta_rgb)
+    bands = [
+        (0.0, 5.0, (0.55, 0.52, 0.35), (0.05, 0.03, 0.02)),
+        (5.0, 25.0, (0.15, 0.45, 0.10), (0.05, 0.15, 0.05)),
+        (30.0, 50.0, (0.20, 0.60, 0.15), (0.30, -0.05, 0.05)),
+        (80.0, 120.0, (0.50, 0.55, 0.20), (0.25, -0.15, 0.12)),
+        (200.0, 300.0, (0.75, 0.40, 0.32), (-0.20, -0.10, -0.02)),
+        (500.0, 1000.0, (0.55, 0.52, 0.50), (0.40, 0.43, 0.45)),
+    ]
+    ts = [np.clip((elev - lo) / span, 0.0, 1.0) for lo, span, _, _ in bands]
+
+    rgb = np.empty(elev.shape + (3,), dtype=np.float32)
+    water = (0.18, 0.25, 0.38)
+    for ch in range(3):
+        choices = [np.full_like(elev, water[ch], dtype=np.float64)]
+        choices += [base[ch] + t * delta[ch]
+                    for t, (_, _, base, delta) in zip(ts, bands)]
+        # conds covers water + the first five ramps; elev >= 500 falls
+        # through to the mountain ramp as the default
+        rgb[..., ch] = np.select(conds, choices[:-1], default=choices[-1])
+
+    return rgb
+
+
+def elevation_color_lut(elev_min, elev_max, size=4096):
+    """Precompute an RGBA lookup table spanning elev_min..elev_max.
+
+    Runs the piecewise palette once over `size` samples; callers then
+    map elevations to colors with a clip + integer index — no branches
+    or float math per cell."""
+    samples = np.linspace(elev_min, elev_max, size)
+    rgb = (elevation_to_colors(samples) * 255).astype(np.uint8)
+    alpha = np.full((size, 1), 255, dtype=np.uint8)
+    return np.concatenate([rgb, alpha], axis=-1)
+
+
+def build_mesh(elev_data, grid_size, cell_size_m, vert_exag, with_colors=True):
+    """Build terrain mesh arrays with elevation-based vertex colors.
+    Returns (vertices (N,3) float32, faces (F,3) uint16/uint32, colors
+    (N,4) uint8 or None) ready for export_glb."""
     rows, cols = elev_data.shape
     elev_min = float(elev_data.min())
 
@@ -389,52 +591,174 @@ def build_mesh(elev_data, grid_size, cell_size_m, vert_exag):
     half_x = (cols - 1) * cell_size_m / 2.0
     half_z = (rows - 1) * cell_size_m / 2.0
 
-    # Build vertices
-    vertices = []
-    colors = []
-    for r in range(rows):
-        for c in range(cols):
-            x = c * cell_size_m - half_x
-            y = (elev_data[r, c] - elev_min) * vert_exag
-            z = r * cell_size_m - half_z
-            vertices.append([x, y, z])
-
-            rgb = elevation_to_color(elev_data[r, c])
-            colors.append([int(rgb[0]*255), int(rgb[1]*255), int(rgb[2]*255), 255])
-
-    vertices = np.array(vertices, dtype=np.float64)
-    colors = np.array(colors, dtype=np.uint8)
-
-    # Build faces (two triangles per quad)
-    faces = []
-    for r in range(rows - 1):
-        for c in range(cols - 1):
-            i00 = r * cols + c
-            i10 = (r + 1) * cols + c
-            i01 = r * cols + (c + 1)
-            i11 = (r + 1) * cols + (c + 1)
-            faces.append([i00, i10, i01])
-            faces.append([i01, i10, i11])
-
-    faces = np.array(faces, dtype=np.int64)
-
-    mesh = trimesh.Trimesh(
-        vertices=vertices,
-        faces=faces,
-        vertex_colors=colors,
-        process=False,
-    )
+    # Build vertices (vectorized, float32 end to end — glTF positions
+    # are float32 anyway, so float64 would just double memory traffic)
+    xs = (np.arange(cols, dtype=np.float32) * cell_size_m - half_x).astype(np.float32)
+    zs = (np.arange(rows, dtype=np.float32) * cell_size_m - half_z).astype(np.float32)
+    X, Z = np.meshgrid(xs, zs)
+    Y = ((elev_data - elev_min) * vert_exag).astype(np.float32)
+    vertices = np.stack([X, Y, Z], axis=-1).reshape(-1, 3)
+
+    if with_colors:
+        # Color via LUT gather: one integer bucket per cell
+        elev_max = float(elev_data.max())
+        lut = elevation_color_lut(elev_min, elev_max)
+        span = max(elev_max - elev_min, 1e-6)
+        idx = np.clip(((elev_data - elev_min) / span * (len(lut) - 1)).astype(np.int32),
+                      0, len(lut) - 1)
+        colors = lut[idx].reshape(-1, 4)
+    else:
+        colors = None
+
+    # Build faces (two triangles per quad) from an index grid
+    idx = np.arange(rows * cols).reshape(rows, cols)
+    i00 = idx[:-1, :-1]
+    i10 = idx[1:, :-1]
+    i01 = idx[:-1, 1:]
+    i11 = idx[1:, 1:]
+    # uint16 indices need max index <= 65534 — glTF reserves 65535 for
+    # primitive restart, so a full 65536-vertex grid must use uint32
+    faces_dtype = np.uint16 if rows * cols < 65536 else np.uint32
+    faces = np.stack(
+        [np.stack([i00, i10, i01], axis=-1), np.stack([i01, i10, i11], axis=-1)],
+        axis=-2,
+    ).reshape(-1, 3).astype(faces_dtype)
+
+    return vertices, faces, colors
+
+
+def export_glb(vertices, faces, colors, output_path):
+    """Write a GLB (binary glTF 2.0) terrain mesh directly.
+
+    The topology is a plain indexed triangle grid, so we emit the JSON
+    header and BIN chunk ourselves — no trimesh scene graph, normals, or
+    edge bookkeeping. Positions go out as float32, indices as uint32,
+    colors (optional) as normalized uint8 RGBA. Indices go out as
+    uint16 when the maximum index stays below 65535 (reserved by glTF
+    for primitive restart), else uint32.
+
+    When colors are present, positions and colors are interleaved into a
+    single 16-byte-stride vertex buffer ([x y z | rgba], 4-byte aligned)
+    so the GPU reads each vertex from one cache line."""
+    positions = np.ascontiguousarray(vertices, dtype=np.float32)
+    index_dtype = np.uint16 if len(positions) < 65536 else np.uint32
+    indices = np.ascontiguousarray(faces, dtype=index_dtype).reshape(-1)
+
+    ARRAY_BUFFER, ELEMENT_ARRAY_BUFFER = 34962, 34963
+    FLOAT, UNSIGNED_BYTE, UNSIGNED_SHORT, UNSIGNED_INT = 5126, 5121, 5123, 5125
+
+    buffer_views = []
+    accessors = []
+    blobs = []
+    offset = 0
+
+    def add_blob(arr, target, byte_stride=None):
+        nonlocal offset
+        blob = arr.tobytes()
+        blob += b'\x00' * (-len(blob) % 4)  # keep accessors 4-byte aligned
+        view = {
+            'buffer': 0,
+            'byteOffset': offset,
+            'byteLength': len(blob),
+            'target': target,
+        }
+        if byte_stride is not None:
+            view['byteStride'] = byte_stride
+        buffer_views.append(view)
+        blobs.append(blob)
+        offset += len(blob)
+        return len(buffer_views) - 1
+
+    position_accessor = {
+        'componentType': FLOAT,
+        'count': len(positions),
+        'type': 'VEC3',
+        'min': positions.min(axis=0).tolist(),
+        'max': positions.max(axis=0).tolist(),
+    }
+    attributes = {'POSITION': 0}
 
-    return mesh
+    if colors is None:
+        position_accessor['bufferView'] = add_blob(positions, ARRAY_BUFFER)
+        accessors.append(position_accessor)
+    else:
+        # Interleave into one strided VBO
+        vbo = np.empty(len(positions),
+                       dtype=[('position', np.float32, 3), ('color', np.uint8, 4)])
+        vbo['position'] = positions
+        vbo['color'] = colors
+        view = add_blob(vbo, ARRAY_BUFFER, byte_stride=vbo.itemsize)
+        position_accessor['bufferView'] = view
+        accessors.append(position_accessor)
+        attributes['COLOR_0'] = len(accessors)
+        accessors.append({
+            'bufferView': view,
+            'byteOffset': 12,
+            'componentType': UNSIGNED_BYTE,
+            'normalized': True,
+            'count': len(colors),
+            'type': 'VEC4',
+        })
+
+    index_accessor = len(accessors)
+    accessors.append({
+        'bufferView': add_blob(indices, ELEMENT_ARRAY_BUFFER),
+        'componentType': UNSIGNED_SHORT if index_dtype is np.uint16 else UNSIGNED_INT,
+        'count': len(indices),
+        'type': 'SCALAR',
+    })
+
+    gltf = {
+        'asset': {'version': '2.0', 'generator': 'flood-sim fetch_terrain'},
+        'scene': 0,
+        'scenes': [{'nodes': [0]}],
+        'nodes': [{'mesh': 0}],
+        'meshes': [{'primitives': [{
+            'attributes': attributes,
+            'indices': index_accessor,
+            'mode': 4,  # TRIANGLES
+        }]}],
+        'accessors': accessors,
+        'bufferViews': buffer_views,
+        'buffers': [{'byteLength': offset}],
+    }
 
+    json_chunk = json.dumps(gltf, separators=(',', ':')).encode('utf-8')
+    json_chunk += b' ' * (-len(json_chunk) % 4)
+    bin_chunk = b''.join(blobs)
 
-def export_heightmap(elev_data, vert_exag, elev_min, output_path):
-    """Export heightmap as raw Float32 binary (row-major, little-endian).
-    Values are in scene coordinates (elevation - min) * vert_exag."""
+    with open(output_path, 'wb') as f:
+        total = 12 + 8 + len(json_chunk) + 8 + len(bin_chunk)
+        f.write(struct.pack('<4sII', b'glTF', 2, total))
+        f.write(struct.pack('<I4s', len(json_chunk), b'JSON'))
+        f.write(json_chunk)
+        f.write(struct.pack('<I4s', len(bin_chunk), b'BIN\x00'))
+        f.write(bin_chunk)
+
+
+def export_heightmap(elev_data, vert_exag, elev_min, output_path, dtype='f32'):
+    """Export heightmap as a raw binary (row-major, little-endian).
+    Values are in scene coordinates (elevation - min) * vert_exag.
+
+    dtype 'f32' writes float32 (the default the viewer expects). 'i16'
+    writes int16 quantized by a scale factor, 'bf16' writes the top 16
+    bits of each float32 (bfloat16) — both halve the file size. Returns
+    (scene_heights, height_scale); height_scale is the factor a consumer
+    multiplies stored values by to recover meters (None for f32/bf16)."""
     scene_heights = ((elev_data - elev_min) * vert_exag).astype(np.float32)
-    scene_heights.tofile(output_path)
-    print(f"  Exported heightmap: {output_path} ({scene_heights.shape})")
-    return scene_heights
+    height_scale = None
+
+    if dtype == 'i16':
+        max_h = float(scene_heights.max())
+        height_scale = (max_h / 32767.0) if max_h > 0 else 1.0
+        (scene_heights / height_scale).astype(np.int16).tofile(output_path)
+    elif dtype == 'bf16':
+        (scene_heights.view(np.uint32) >> 16).astype(np.uint16).tofile(output_path)
+    else:
+        scene_heights.tofile(output_path)
+
+    print(f"  Exported heightmap: {output_path} ({scene_heights.shape}, {dtype})")
+    return scene_heights, height_scale
 
 
 def main():
@@ -449,6 +773,13 @@ def main():
     parser.add_argument('--vert-exag', type=float, default=None, help='Override vertical exaggeration')
     parser.add_argument('--input-tif', type=str, help='Use existing GeoTIFF instead of fetching SRTM')
     parser.add_argument('--output-dir', type=str, default=None, help='Output directory (default: ../data)')
+    parser.add_argument('--heightmap-dtype', type=str, default='f32',
+                        choices=['f32', 'i16', 'bf16'],
+                        help='Heightmap binary format (i16/bf16 halve the file size)')
+    parser.add_argument('--no-mesh', action='store_true',
+                        help='Skip building/exporting terrain.glb (heightmap-only consumers)')
+    parser.add_argument('--no-colors', action='store_true',
+                        help='Skip per-vertex colors in the mesh (geometry only)')
     parser.add_argument('--overlay', action='store_true', help='Fetch OSM map overlay (roads, labels)')
     parser.add_argument('--plot', action='store_true', help='Show matplotlib plot of heightmap')
 
@@ -524,7 +855,7 @@ def main():
 
     # Calculate cell size in meters
     lat_extent_m = (north - south) * 111000
-    lon_extent_m = (east - west) * 111000 * np.cos(np.radians(center_lat))
+    lon_extent_m = (east - west) * 111000 * math.cos(math.radians(center_lat))
     cell_size_m = max(lat_extent_m, lon_extent_m) / grid_size
 
     print(f"\n  Elevation range: {elev_data.min():.1f}m - {elev_data.max():.1f}m")
@@ -538,7 +869,8 @@ def main():
     elev_min = float(elev_data.min())
     elev_max = float(elev_data.max())
     heightmap_path = os.path.join(output_dir, 'heightmap.bin')
-    export_heightmap(elev_data, vert_exag, elev_min, heightmap_path)
+    _, height_scale = export_heightmap(elev_data, vert_exag, elev_min,
+                                       heightmap_path, dtype=args.heightmap_dtype)
 
     # Export metadata
     meta = {
@@ -557,18 +889,25 @@ def main():
         'center_lon': round(center_lon, 6),
         'location_name': location_name,
         'scale': args.scale,
+        'heightmap_dtype': args.heightmap_dtype,
     }
+    if height_scale is not None:
+        meta['height_scale'] = height_scale
     meta_path = os.path.join(output_dir, 'heightmap_meta.json')
     with open(meta_path, 'w') as f:
         json.dump(meta, f, indent=2)
     print(f"  Exported metadata: {meta_path}")
 
     # Build and export mesh
-    print(f"\n  Building terrain mesh...")
-    mesh = build_mesh(elev_data, grid_size, cell_size_m, vert_exag)
-    glb_path = os.path.join(output_dir, 'terrain.glb')
-    mesh.export(glb_path)
-    print(f"  Exported mesh: {glb_path} ({len(mesh.vertices)} vertices, {len(mesh.faces)} faces)")
+    if args.no_mesh:
+        print(f"\n  Skipping mesh export (--no-mesh)")
+    else:
+        print(f"\n  Building terrain mesh...")
+        vertices, faces, colors = build_mesh(elev_data, grid_size, cell_size_m, vert_exag,
+                                             with_colors=not args.no_colors)
+        glb_path = os.path.join(output_dir, 'terrain.glb')
+        export_glb(vertices, faces, colors, glb_path)
+        print(f"  Exported mesh: {glb_path} ({len(vertices)} vertices, {len(faces)} faces)")
 
     # OSM overlay
     if args.overlay: